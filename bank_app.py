@@ -1,9 +1,12 @@
 import streamlit as st
-import pandas as pd
-from db_config import connect
+from db_config import get_conn
 import mysql.connector
+from mysql.connector import errorcode
 import bcrypt
-import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 
 # --- UI Layout Configuration ---
 st.set_page_config(
@@ -19,70 +22,114 @@ if 'logged_in' not in st.session_state:
 # Stores the email of the logged-in user
 if 'user_email' not in st.session_state:
     st.session_state.user_email = None
+# Holds a toast message to display on the next run
+if 'pending_toast' not in st.session_state:
+    st.session_state.pending_toast = None
+# Keyset pagination for the accounts table: the last id before each visited page
+if 'accounts_page_starts' not in st.session_state:
+    st.session_state.accounts_page_starts = [0]
 
 
 # --- DATABASE SETUP (User Table) ---
 
 def create_user_table(db_connection):
     """Ensures the users table exists for login/registration with Email and Hashed Password."""
+    # Only saving email and password hash
+    sql = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        password_hash BINARY(60) NOT NULL,  -- raw bcrypt output, always 60 bytes
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
     try:
-        cursor = db_connection.cursor()
-        # Only saving email and password hash
-        sql = """
-        CREATE TABLE IF NOT EXISTS users (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            email VARCHAR(100) UNIQUE NOT NULL,
-            password_hash VARCHAR(255) NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-        cursor.execute(sql)
-        db_connection.commit()
+        with db_connection.cursor() as cursor:
+            cursor.execute(sql)
     except mysql.connector.Error as err:
         st.error(f"FATAL: Error initializing user table: {err}. Check MySQL permissions and database status.")
         st.stop()
 
 
+@st.cache_resource
+def _ensure_schema():
+    """Runs the schema setup once per server process instead of on every rerun."""
+    with get_conn() as db_conn:
+        create_user_table(db_conn)
+    return True
+
+
+# --- PASSWORD HASHING ---
+
+# bcrypt cost factor, pinned explicitly (12 is bcrypt's default cost); raise it if hashing is fast on the server
+BCRYPT_ROUNDS = 12
+
+
+@st.cache_resource
+def get_hash_executor():
+    """Shared worker pool for bcrypt, so hashing is bounded by the number of CPU cores."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+
+
+def hash_password(password):
+    """Hashes a password with bcrypt on the shared hashing pool."""
+    return get_hash_executor().submit(
+        bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).result()
+
+
+@st.cache_resource
+def get_dummy_hash():
+    """A fixed bcrypt hash (same cost) to compare against when an email is not registered."""
+    return hash_password("dummy-password")
+
+
+def check_password(password, stored_hash):
+    """Verifies a password against a bcrypt hash on the shared hashing pool."""
+    return get_hash_executor().submit(bcrypt.checkpw, password.encode('utf-8'), stored_hash).result()
+
+
 # --- AUTHENTICATION DB FUNCTIONS ---
 
 def register_user(email, password):
     """Registers a new user and hashes the password using bcrypt."""
-    db = connect()
     try:
-        cursor = db.cursor()
-        
-        # 1. Hash the password securely
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-        # 2. Insert into users table
-        sql = "INSERT INTO users (email, password_hash) VALUES (%s, %s)"
-        values = (email, hashed_password)
-        cursor.execute(sql, values)
-        db.commit()
-        return True, "Registration successful! You can now log in."
+        # 1. Hash the password securely (before taking a pooled connection)
+        hashed_password = hash_password(password)
+
+        with get_conn() as db, db.cursor() as cursor:
+            # 2. Insert into users table
+            sql = "INSERT INTO users (email, password_hash) VALUES (%s, %s)"
+            values = (email, hashed_password)
+            cursor.execute(sql, values)
+            return True, "Registration successful! You can now log in."
     except mysql.connector.Error as err:
-        if 'Duplicate entry' in str(err) and 'email' in str(err):
+        # users.email is the table's only unique key besides the primary key
+        if err.errno == errorcode.ER_DUP_ENTRY:
             return False, "This email is already registered."
         return False, f"Database error: {err}"
 
 
 def authenticate_user(email, password):
     """Checks user email/password credentials against the database."""
-    db = connect()
     try:
-        cursor = db.cursor()
-        cursor.execute("SELECT password_hash FROM users WHERE email = %s", (email,))
-        result = cursor.fetchone()
-        
+        with get_conn() as db, db.cursor() as cursor:
+            cursor.execute("SELECT password_hash FROM users WHERE email = %s", (email,))
+            result = cursor.fetchone()
+
+        # Unknown emails are checked against a dummy hash so both failure cases cost
+        # one bcrypt comparison and get the same message (no user enumeration).
         if result:
-            stored_hash = result[0].encode('utf-8')
-            # Verify the entered password against the stored hash
-            if bcrypt.checkpw(password.encode('utf-8'), stored_hash):
-                return True, "Credentials verified."
-            else:
-                return False, "Incorrect password."
+            stored_hash = result[0]
+            # Tables created before the BINARY(60) column return the hash as str;
+            # bytes() is a no-op for bytes and normalises a bytearray from the connector
+            stored_hash = stored_hash.encode('utf-8') if isinstance(stored_hash, str) else bytes(stored_hash)
         else:
-            return False, "Email not found."
+            stored_hash = get_dummy_hash()
+        # Verify the entered password against the stored hash
+        if check_password(password, stored_hash) and result:
+            return True, "Credentials verified."
+        return False, "Invalid email or password."
     except mysql.connector.Error as err:
         return False, f"Authentication error: {err}"
 
@@ -143,82 +190,122 @@ def logout():
     """Clears session state and reruns the app to show the login page."""
     st.session_state.logged_in = False
     st.session_state.user_email = None
-    st.toast("Logged out successfully!")
-    time.sleep(0.5)
+    # Shown by main() on the next run, so logout doesn't have to wait for the toast
+    st.session_state.pending_toast = "Logged out successfully!"
     st.rerun()
 
 
 # --- EXISTING BANKING FUNCTIONS (Access database for banking data) ---
 
+# Rows per multi-row INSERT when bulk-creating accounts
+BULK_INSERT_BATCH_SIZE = 10000
+# Rows per page in the "View All Accounts" table
+ACCOUNTS_PAGE_SIZE = 100
+# Explicit column types for the accounts DataFrame
+ACCOUNT_DTYPES = {"id": "int64", "balance": "float64"}
+
+
 def create_account_db(name, email, balance):
     """Inserts a new account into the database."""
-    db = connect()
     try:
-        cursor = db.cursor()
-        sql = "INSERT INTO accounts (`name`, `email`, `balance`) VALUES (%s, %s, %s)"
-        values = (name, email, balance)
-        cursor.execute(sql, values)
-        db.commit()
-        connect.clear()
+        with get_conn() as db, db.cursor() as cursor:
+            sql = "INSERT INTO accounts (`name`, `email`, `balance`) VALUES (%s, %s, %s)"
+            values = (name, email, balance)
+            cursor.execute(sql, values)
+        get_all_accounts.clear()
         return True, "Account created successfully!"
     except mysql.connector.Error as err:
         return False, f"Error creating account: {err}"
 
-def get_all_accounts():
-    """Fetches all accounts and returns as a list of dicts/tuples."""
-    db = connect()
+def create_accounts_bulk(rows):
+    """
+    Inserts many (name, email, balance) rows in one transaction.
+    executemany() rewrites the INSERT into multi-row VALUES batches of
+    BULK_INSERT_BATCH_SIZE rows instead of one round trip per account.
+    """
+    sql = "INSERT INTO accounts (`name`, `email`, `balance`) VALUES (%s, %s, %s)"
+    rows = iter(rows)
+    inserted = 0
     try:
-        cursor = db.cursor()
-        cursor.execute("SELECT id, name, email, balance FROM accounts")
-        accounts = cursor.fetchall()
-        column_names = [i[0] for i in cursor.description]
-        return column_names, accounts
+        with get_conn() as db, db.cursor() as cursor:
+            db.start_transaction()
+            while batch := list(islice(rows, BULK_INSERT_BATCH_SIZE)):
+                cursor.executemany(sql, batch)
+                inserted += len(batch)
+            db.commit()
+        get_all_accounts.clear()
+        return True, f"{inserted} accounts created successfully!"
     except mysql.connector.Error as err:
-        st.error(f"Error fetching accounts: {err}")
-        return [], []
+        return False, f"Error creating accounts: {err}"
+
+# Cached per (last_id, limit) and cleared by the functions that modify accounts.
+# Errors are raised rather than returned so that failures are never cached.
+@st.cache_data(ttl=30, show_spinner=False)
+def get_all_accounts(last_id=0, limit=ACCOUNTS_PAGE_SIZE):
+    """Fetches one page of accounts with id > last_id as a typed DataFrame."""
+    # Deferred import: sessions that never open the accounts table don't pay for pandas
+    import pandas as pd
+
+    with get_conn() as db, db.cursor() as cursor:
+        # Keyset pagination: every page is a range scan on the primary key, however deep
+        cursor.execute(
+            "SELECT id, name, email, balance FROM accounts WHERE id > %s ORDER BY id LIMIT %s",
+            (last_id, limit)
+        )
+        column_names = [i[0] for i in cursor.description]
+        df = pd.DataFrame.from_records(cursor, columns=column_names)
+    # id as int64 and balance as float64 instead of DECIMAL objects
+    return df.astype(ACCOUNT_DTYPES)
 
 def update_balance(acc_id, amount, operation):
-    """Performs deposit or withdrawal."""
-    db = connect()
+    """Performs deposit or withdrawal and returns the updated balance."""
+    if operation == "WITHDRAW":
+        # Check and debit in one statement so concurrent withdrawals can't overdraw
+        sql = "UPDATE accounts SET balance = balance - %s WHERE id = %s AND balance >= %s"
+        params = (amount, acc_id, amount)
+    elif operation == "DEPOSIT":
+        sql = "UPDATE accounts SET balance = balance + %s WHERE id = %s"
+        params = (amount, acc_id)
+    else:
+        return False, "Invalid operation type."
+
     try:
-        cursor = db.cursor()
-        
-        if operation == "WITHDRAW":
+        with get_conn() as db, db.cursor() as cursor:
+            # Pooled connections run in autocommit mode, so writes open their transaction explicitly
+            db.start_transaction()
+            cursor.execute(sql, params)
+            updated = cursor.rowcount
+            # Read the balance on the same connection before the transaction ends
             cursor.execute("SELECT balance FROM accounts WHERE id = %s", (acc_id,))
             result = cursor.fetchone()
+            if updated:
+                db.commit()
+            else:
+                db.rollback()
+
+        if not updated:
+            # Find out whether the account is missing or short of funds
             if not result:
                 return False, "Account ID not found."
-            current_balance = result[0]
-            if current_balance < amount:
-                return False, f"INSUFFICIENT BALANCE. Current balance: ₹{current_balance:.2f}"
-            sql = "UPDATE accounts SET balance = balance - %s WHERE id = %s"
-        elif operation == "DEPOSIT":
-            sql = "UPDATE accounts SET balance = balance + %s WHERE id = %s"
-        else:
-            return False, "Invalid operation type."
+            if operation == "WITHDRAW":
+                return False, f"INSUFFICIENT BALANCE. Current balance: ₹{result[0]:.2f}"
+            return False, "Account ID not found or no change made."
+
+        get_all_accounts.clear()
 
-        cursor.execute(sql, (amount, acc_id))
-        
-        if cursor.rowcount == 0:
-             return False, "Account ID not found or no change made."
-             
-        db.commit()
-        connect.clear()
-        
         action_word = "DEPOSITED" if operation == "DEPOSIT" else "WITHDRAWAL"
-        return True, f"{action_word} successful."
+        return True, {"message": f"{action_word} successful.", "balance": result[0]}
         
     except mysql.connector.Error as err:
         return False, f"Transaction error: {err}"
 
 def get_balance(acc_id):
     """Fetches name and balance for a given account ID."""
-    db = connect()
     try:
-        cursor = db.cursor()
-        cursor.execute("SELECT name, balance FROM accounts where id= %s", (acc_id,))
-        result = cursor.fetchone()
-        
+        with get_conn() as db, db.cursor() as cursor:
+            cursor.execute("SELECT name, balance FROM accounts where id= %s", (acc_id,))
+            result = cursor.fetchone()
+
         if result:
             return True, {"name": result[0], "balance": result[1]}
         else:
@@ -250,12 +337,33 @@ def create_account_ui():
                 else:
                     st.error(message)
 
+def _prev_accounts_page():
+    """Steps the accounts table back to the previous page."""
+    st.session_state.accounts_page_starts.pop()
+
+
+def _next_accounts_page(last_id):
+    """Advances the accounts table to the page after `last_id`."""
+    st.session_state.accounts_page_starts.append(last_id)
+
+
 def view_accounts_ui():
-    """UI for viewing all bank accounts."""
+    """UI for viewing all bank accounts, one page at a time."""
     st.subheader("👥 View All Accounts")
-    column_names, accounts = get_all_accounts()
-    if accounts:
-        df = pd.DataFrame(accounts, columns=column_names)
+    page_starts = st.session_state.accounts_page_starts
+    try:
+        # One extra row is fetched only to tell whether a next page exists
+        df = get_all_accounts(page_starts[-1], ACCOUNTS_PAGE_SIZE + 1)
+    except mysql.connector.Error as err:
+        st.error(f"Error fetching accounts: {err}")
+        return
+    if df.empty and len(page_starts) > 1:
+        # This page starts past the last row (e.g. rows deleted outside the app): start over
+        st.session_state.accounts_page_starts = [0]
+        st.rerun()
+    has_next = len(df) > ACCOUNTS_PAGE_SIZE
+    df = df.iloc[:ACCOUNTS_PAGE_SIZE]
+    if not df.empty:
         st.data_editor(
             df, 
             width='stretch', 
@@ -267,6 +375,15 @@ def view_accounts_ui():
                 )
             }
         )
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        col_prev.button("◀ Prev", on_click=_prev_accounts_page, disabled=len(page_starts) == 1)
+        col_page.caption(f"Page {len(page_starts)}")
+        col_next.button(
+            "Next ▶",
+            on_click=_next_accounts_page,
+            args=(int(df["id"].iloc[-1]),),
+            disabled=not has_next
+        )
     else:
         st.info("No accounts found in the database.")
 
@@ -286,14 +403,12 @@ def transaction_ui(operation):
             elif acc_id < 1:
                 st.warning("Please enter a valid Account ID.")
             else:
-                success, message = update_balance(int(acc_id), float(amount), operation.upper())
+                success, result = update_balance(int(acc_id), float(amount), operation.upper())
                 if success:
-                    st.success(message)
-                    balance_success, balance_data = get_balance(int(acc_id))
-                    if balance_success:
-                        st.write(f"**Updated Balance for Account ID {acc_id}: ₹{balance_data['balance']:.2f}**")
+                    st.success(result["message"])
+                    st.write(f"**Updated Balance for Account ID {acc_id}: ₹{result['balance']:.2f}**")
                 else:
-                    st.error(message)
+                    st.error(result)
 
 
 def check_balance_ui():
@@ -314,17 +429,31 @@ def check_balance_ui():
                     st.error(data) 
 
 
+# Sidebar menu label -> page renderer
+MENU = {
+    "Create Account": create_account_ui,
+    "View All Accounts": view_accounts_ui,
+    "Deposit Money": partial(transaction_ui, "Deposit"),
+    "Withdraw Money": partial(transaction_ui, "Withdraw"),
+    "Check Balance": check_balance_ui,
+}
+
+
 # --- Main Application Logic ---
 
 def main():
     try:
-        # Step 1: Attempt to establish the connection first. 
-        db_conn = connect() 
-        
-        # Step 2: If connection is successful, ensure the user table exists.
-        create_user_table(db_conn)
+        if st.session_state.pending_toast:
+            st.toast(st.session_state.pending_toast)
+            st.session_state.pending_toast = None
 
-        # Step 3: Run the main application logic
+        # Step 1: Build the connection pool and ensure the user table exists
+        # (cached, so this only touches the database on the first run of the process).
+        _ensure_schema()
+        # Precompute the dummy hash now, so the first unknown-email login isn't the one paying for it
+        get_dummy_hash()
+
+        # Step 2: Run the main application logic
         if not st.session_state.logged_in:
             login_page()
         else:
@@ -335,35 +464,14 @@ def main():
             st.sidebar.markdown("---")
             st.sidebar.header("Navigation")
             
-            menu_options = [
-                "Create Account", 
-                "View All Accounts", 
-                "Deposit Money", 
-                "Withdraw Money", 
-                "Check Balance"
-            ]
-            
-            choice = st.sidebar.radio("Select Operation", menu_options)
+            choice = st.sidebar.radio("Select Operation", list(MENU))
             
             st.markdown("---")
 
-            if choice == "Create Account":
-                create_account_ui()
-            elif choice == "View All Accounts":
-                view_accounts_ui()
-            elif choice == "Deposit Money":
-                transaction_ui("Deposit")
-            elif choice == "Withdraw Money":
-                transaction_ui("Withdraw")
-            elif choice == "Check Balance":
-                check_balance_ui()
+            MENU[choice]()
             
             st.sidebar.markdown("---")
-<<<<<<< HEAD
             st.sidebar.info("Developed by student")
-=======
-            
->>>>>>> 47c42ad51fe4e6148170efe90525c362bc488896
 
     except Exception as e:
         st.error("A critical error occurred during application startup.")
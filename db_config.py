@@ -1,45 +1,97 @@
-import mysql.connector
+import os
+import random
 import streamlit as st
+import threading
 import time
+from contextlib import contextmanager
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool, CNX_POOL_MAXSIZE
 
-# Configuration for retries
+# Configuration for retries (exponential backoff with random jitter)
 MAX_RETRIES = 5
-RETRY_DELAY = 2  # seconds
+RETRY_BASE_DELAY = 0.5  # seconds
+RETRY_MAX_DELAY = 30  # seconds
+
+# Pool sizing: roughly (cores * 2) + effective spindles, capped at the connector's maximum
+POOL_SIZE = min((os.cpu_count() or 1) * 2 + 1, CNX_POOL_MAXSIZE)
+# How long a session waits for a free pooled connection before giving up
+POOL_CHECKOUT_TIMEOUT = 10  # seconds
 
 @st.cache_resource
-def connect():
+def get_pool():
     """
-    Establishes and caches the MySQL database connection with retry logic.
-    Retries up to MAX_RETRIES times if connection initially fails.
-    The process is now silent in the UI.
+    Creates and caches the MySQL connection pool with retry logic.
+    Retries up to MAX_RETRIES times if the pool cannot be created initially.
+    The process is silent in the UI.
     """
-    
+
     for attempt in range(MAX_RETRIES):
         try:
             # NOTE: Using the credentials from your original file. Double-check these!
-            db = mysql.connector.connect(
+            return MySQLConnectionPool(
+                pool_name="bank",
+                pool_size=POOL_SIZE,
+                pool_reset_session=False,
+                # Reads run without an implicit transaction; writes call start_transaction()
+                autocommit=True,
                 host="localhost",
                 user="root",
                 password="Pawan123@",
                 database="bank_system"
             )
-            
-            if db.is_connected():
-                # Success is silent now, just return the connection
-                return db
-            
+
         except Error as err:
             # Errors are only printed to the terminal console, not the Streamlit UI
             print(f"DEBUG: DB Connection attempt {attempt + 1}/{MAX_RETRIES} failed: {err}")
-            
-            # If this is not the last attempt, wait before retrying
+
+            # If this is not the last attempt, back off before retrying. The jitter keeps
+            # many sessions restarting at once from retrying in lockstep.
             if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY)
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.uniform(0, RETRY_BASE_DELAY)
+                print(f"DEBUG: Retrying DB connection (attempt {attempt + 2}/{MAX_RETRIES}) in {delay:.2f}s")
+                time.sleep(delay)
             else:
                 # If all attempts fail, halt the app with a silent st.stop()
                 st.error(" Failed to establish database connection after multiple retries. Please check your MySQL server and credentials.")
                 st.stop()
-    
+
     # This line should ideally not be reached, but ensures a final stop if loop somehow exits.
-    st.stop()
\ No newline at end of file
+    st.stop()
+
+
+@st.cache_resource
+def get_checkout_slots():
+    """
+    One semaphore slot per pooled connection. MySQLConnectionPool raises as soon
+    as it is exhausted, so sessions queue here instead of failing outright.
+    """
+    return threading.BoundedSemaphore(POOL_SIZE)
+
+
+@contextmanager
+def get_conn():
+    """
+    Checks a connection out of the shared pool for the duration of a `with` block,
+    waiting up to POOL_CHECKOUT_TIMEOUT seconds if every connection is in use.
+    The pool reconnects stale connections on checkout, and leaving the block rolls
+    back any uncommitted transaction and hands the connection back to the pool
+    instead of disconnecting.
+    """
+    slots = get_checkout_slots()
+    if not slots.acquire(timeout=POOL_CHECKOUT_TIMEOUT):
+        raise PoolError("Timed out waiting for a free database connection.")
+    try:
+        db = get_pool().get_connection()
+        try:
+            yield db
+        finally:
+            try:
+                # pool_reset_session is off, so never hand back a connection with an
+                # open transaction (it would keep row locks and a stale snapshot)
+                if db.in_transaction:
+                    db.rollback()
+            finally:
+                db.close()
+    finally:
+        slots.release()